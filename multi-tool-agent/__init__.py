@@ -6,31 +6,44 @@ time information for any city worldwide.
 
 # Import modules without executing them immediately
 from . import config
-from . import services
 
-# Only import the main agent and functions when needed
+# Attributes resolved from submodules on first access (PEP 562).
+# An attribute name of None exposes the submodule itself.
+_LAZY = {
+    'services': ('services', None),
+    'root_agent': ('agent', 'root_agent'),
+    'get_weather': ('agent', 'get_weather'),
+    'get_weather_forecast': ('agent', 'get_weather_forecast'),
+    'get_current_time': ('agent', 'get_current_time'),
+    'get_time_difference': ('agent', 'get_time_difference'),
+    'get_world_clock': ('agent', 'get_world_clock'),
+    'get_city_info': ('agent', 'get_city_info'),
+}
+
+def __getattr__(name):
+    """Import submodules and agent attributes lazily so importing the package stays cheap."""
+    if name in _LAZY:
+        import importlib
+        module_name, attr = _LAZY[name]
+        module = importlib.import_module(f".{module_name}", __name__)
+        value = module if attr is None else getattr(module, attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
 def get_agent():
     """Get the main agent instance."""
-    from .agent import root_agent
-    return root_agent
+    return __getattr__('root_agent')
 
 def get_functions():
     """Get all agent functions."""
-    from .agent import (
-        get_weather,
-        get_weather_forecast,
-        get_current_time,
-        get_time_difference,
-        get_world_clock,
-        get_city_info
-    )
     return {
-        'get_weather': get_weather,
-        'get_weather_forecast': get_weather_forecast,
-        'get_current_time': get_current_time,
-        'get_time_difference': get_time_difference,
-        'get_world_clock': get_world_clock,
-        'get_city_info': get_city_info
+        name: __getattr__(name)
+        for name, (module_name, _) in _LAZY.items()
+        if module_name == 'agent' and name != 'root_agent'
     }
 
 __version__ = "2.0.0"
@@ -41,5 +54,12 @@ __all__ = [
     'config', 
     'services',
     'get_agent',
-    'get_functions'
+    'get_functions',
+    'root_agent',
+    'get_weather',
+    'get_weather_forecast',
+    'get_current_time',
+    'get_time_difference',
+    'get_world_clock',
+    'get_city_info'
 ]
\ No newline at end of file
@@ -1,5 +1,7 @@
 """Enhanced multi-tool agent with real-time weather and global time support."""
 
+import functools
+import inspect
 import logging
 from typing import Dict, Any, List, Optional
 from google.adk.agents import Agent
@@ -9,19 +11,105 @@ try:
     from .config import Config
     from .services.weather import weather_service
     from .services.time_service import time_service
-    from .services.utils import location_utils
+    from .services.utils import location_utils, title_case
 except ImportError:
     from config import Config
     from services.weather import weather_service
     from services.time_service import time_service
-    from services.utils import location_utils
+    from services.utils import location_utils, title_case
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Validate configuration on import
 Config.validate_config()
 
+# Accepted values for normalized string arguments
+_UNITS = frozenset(('metric', 'imperial', 'kelvin'))
+_FORMATS = frozenset(('standard', 'detailed', 'utc'))
+
+_EMPTY_CITY_MESSAGE = "City name cannot be empty. Please provide a valid city name."
+
+_SAME_CITY_REPORT = "Both cities ({city}) are the same, so there is no time difference."
+
+# Prebuilt error responses, shared between calls and never mutated
+_NO_CITIES_ERROR = {
+    "status": "error",
+    "error_message": "Please provide a list of cities. Example: ['New York', 'London', 'Tokyo']"
+}
+_NO_VALID_CITIES_ERROR = {
+    "status": "error",
+    "error_message": "No valid city names provided. Please ensure city names are not empty."
+}
+
+
+def _argument_index(func, param: str) -> int:
+    """Return the positional index of a parameter in a function's signature."""
+    return list(inspect.signature(func).parameters).index(param)
+
+
+def validate_city(param: str = "city", error_message: str = _EMPTY_CITY_MESSAGE):
+    """Reject empty city arguments and pass the stripped value to the tool.
+
+    Args:
+        param (str): Name of the city parameter to validate.
+        error_message (str): Message returned when the city is missing or blank.
+    """
+    def decorator(func):
+        index = _argument_index(func, param)
+        error = {
+            "status": "error",
+            "error_message": error_message
+        }
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            positional = index < len(args)
+            value = args[index] if positional else kwargs.get(param)
+            cleaned = value.strip() if isinstance(value, str) else ""
+            if not cleaned:
+                return error
+            if positional:
+                args = args[:index] + (cleaned,) + args[index + 1:]
+            else:
+                kwargs[param] = cleaned
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _normalize_choice(param: str, allowed: frozenset, default: str):
+    """Lower-case a string argument, falling back to a default when not allowed."""
+    def decorator(func):
+        index = _argument_index(func, param)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            positional = index < len(args)
+            value = args[index] if positional else kwargs.get(param, default)
+            value = value.lower() if isinstance(value, str) else default
+            if value not in allowed:
+                value = default
+            if positional:
+                args = args[:index] + (value,) + args[index + 1:]
+            else:
+                kwargs[param] = value
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def validate_units(func):
+    """Normalize the 'units' argument, defaulting to metric."""
+    return _normalize_choice("units", _UNITS, "metric")(func)
+
+
+def validate_format(func):
+    """Normalize the 'format_type' argument, defaulting to standard."""
+    return _normalize_choice("format_type", _FORMATS, "standard")(func)
+
+
+@validate_city()
+@validate_units
 def get_weather(city: str, units: str = "metric") -> Dict[str, Any]:
     """Retrieves the current weather report for a specified city with real-time data.
 
@@ -32,21 +120,11 @@ def get_weather(city: str, units: str = "metric") -> Dict[str, Any]:
     Returns:
         dict: Status and weather report or error message.
     """
-    # Validate inputs
-    if not city or not city.strip():
-        return {
-            "status": "error",
-            "error_message": "City name cannot be empty. Please provide a valid city name."
-        }
-    
-    # Normalize units
-    units = units.lower()
-    if units not in ['metric', 'imperial', 'kelvin']:
-        units = 'metric'  # Default to metric if invalid unit provided
-    
-    return weather_service.get_current_weather(city.strip(), units)
+    return weather_service.get_current_weather(city, units)
 
 
+@validate_city()
+@validate_units
 def get_weather_forecast(city: str, days: int = 3, units: str = "metric") -> Dict[str, Any]:
     """Get weather forecast for a specified city.
 
@@ -58,13 +136,6 @@ def get_weather_forecast(city: str, days: int = 3, units: str = "metric") -> Dic
     Returns:
         dict: Status and forecast data or error message.
     """
-    # Validate inputs
-    if not city or not city.strip():
-        return {
-            "status": "error",
-            "error_message": "City name cannot be empty. Please provide a valid city name."
-        }
-    
     # Validate and normalize days
     try:
         days = int(days)
@@ -72,14 +143,11 @@ def get_weather_forecast(city: str, days: int = 3, units: str = "metric") -> Dic
     except (ValueError, TypeError):
         days = 3  # Default to 3 days if invalid
     
-    # Normalize units
-    units = units.lower()
-    if units not in ['metric', 'imperial', 'kelvin']:
-        units = 'metric'  # Default to metric if invalid unit provided
-    
-    return weather_service.get_weather_forecast(city.strip(), units, days)
+    return weather_service.get_weather_forecast(city, units, days)
 
 
+@validate_city()
+@validate_format
 def get_current_time(city: str, format_type: str = "standard") -> Dict[str, Any]:
     """Returns the current time for any city in the world.
 
@@ -90,21 +158,24 @@ def get_current_time(city: str, format_type: str = "standard") -> Dict[str, Any]
     Returns:
         dict: Status and time information or error message.
     """
-    # Validate inputs
-    if not city or not city.strip():
-        return {
-            "status": "error",
-            "error_message": "City name cannot be empty. Please provide a valid city name."
+    return time_service.get_current_time(city, format_type)
+
+
+def _same_city_result(city1: str, city2: str) -> Dict[str, Any]:
+    """Build the response for a time difference between a city and itself."""
+    return {
+        "status": "success",
+        "report": _SAME_CITY_REPORT.format(city=title_case(city1)),
+        "data": {
+            "city1": city1,
+            "city2": city2,
+            "difference_hours": 0
         }
-    
-    # Normalize format type
-    format_type = format_type.lower()
-    if format_type not in ['standard', 'detailed', 'utc']:
-        format_type = 'standard'  # Default to standard if invalid format provided
-    
-    return time_service.get_current_time(city.strip(), format_type)
+    }
 
 
+@validate_city("city1", "First city name cannot be empty. Please provide valid city names.")
+@validate_city("city2", "Second city name cannot be empty. Please provide valid city names.")
 def get_time_difference(city1: str, city2: str) -> Dict[str, Any]:
     """Calculate the time difference between two cities.
 
@@ -115,31 +186,10 @@ def get_time_difference(city1: str, city2: str) -> Dict[str, Any]:
     Returns:
         dict: Status and time difference information or error message.
     """
-    # Validate inputs
-    if not city1 or not city1.strip():
-        return {
-            "status": "error",
-            "error_message": "First city name cannot be empty. Please provide valid city names."
-        }
-    
-    if not city2 or not city2.strip():
-        return {
-            "status": "error",
-            "error_message": "Second city name cannot be empty. Please provide valid city names."
-        }
+    if city1 is city2 or city1.casefold() == city2.casefold():
+        return _same_city_result(city1, city2)
     
-    if city1.strip().lower() == city2.strip().lower():
-        return {
-            "status": "success",
-            "report": f"Both cities ({city1.strip().title()}) are the same, so there is no time difference.",
-            "data": {
-                "city1": city1.strip(),
-                "city2": city2.strip(),
-                "difference_hours": 0
-            }
-        }
-    
-    return time_service.get_time_difference(city1.strip(), city2.strip())
+    return time_service.get_time_difference(city1, city2)
 
 
 def get_world_clock(cities: List[str]) -> Dict[str, Any]:
@@ -153,22 +203,16 @@ def get_world_clock(cities: List[str]) -> Dict[str, Any]:
     """
     # Validate inputs
     if not cities:
-        return {
-            "status": "error",
-            "error_message": "Please provide a list of cities. Example: ['New York', 'London', 'Tokyo']"
-        }
+        return _NO_CITIES_ERROR
     
-    # Clean and validate city names
-    clean_cities = []
-    for city in cities:
-        if city and isinstance(city, str) and city.strip():
-            clean_cities.append(city.strip())
+    # Clean and validate city names, stripping each entry once
+    clean_cities = [
+        stripped for city in cities
+        if isinstance(city, str) and (stripped := city.strip())
+    ]
     
     if not clean_cities:
-        return {
-            "status": "error",
-            "error_message": "No valid city names provided. Please ensure city names are not empty."
-        }
+        return _NO_VALID_CITIES_ERROR
     
     # Limit to reasonable number of cities to avoid overwhelming output
     if len(clean_cities) > 10:
@@ -186,6 +230,7 @@ def get_world_clock(cities: List[str]) -> Dict[str, Any]:
     return result
 
 
+@validate_city()
 def get_city_info(city: str) -> Dict[str, Any]:
     """Get comprehensive information about a city including coordinates and timezone.
 
@@ -195,17 +240,10 @@ def get_city_info(city: str) -> Dict[str, Any]:
     Returns:
         dict: Status and city information or error message.
     """
-    # Validate inputs
-    if not city or not city.strip():
-        return {
-            "status": "error",
-            "error_message": "City name cannot be empty. Please provide a valid city name."
-        }
-    
-    info = location_utils.get_city_info(city.strip())
+    info = location_utils.get_city_info(city)
     
     if info["success"]:
-        report = f"""Information for {city.title()}:
+        report = f"""Information for {title_case(city)}:
 Coordinates: {info['latitude']:.4f}, {info['longitude']:.4f}
 Timezone: {info['timezone']}
 Full address: {info['full_address']}
@@ -223,87 +261,101 @@ Country: {info['country']}"""
         }
 
 
-# Create the enhanced agent with comprehensive weather and time capabilities
-root_agent = Agent(
-    name="enhanced_weather_time_agent",
-    model="gemini-2.0-flash",
-    description=(
-        "Advanced agent that provides real-time weather data and time information for any city worldwide. "
-        "Supports weather forecasts, time zone conversions, world clock, and city information lookup."
-    ),
-    instruction=(
-        "You are a helpful and knowledgeable assistant with access to real-time weather data and comprehensive global time zone information. "
-        "Your expertise covers weather conditions, forecasts, time zones, and geographical information for any city worldwide."
-        
-        "\n\n=== CORE CAPABILITIES ==="
-        "\n• Real-time weather data from OpenWeatherMap API with fallback to demo data"
-        "\n• Weather forecasts up to 5 days for any city"
-        "\n• Current time and timezone information for any global location"
-        "\n• Time zone conversions and differences between cities"
-        "\n• World clock functionality for multiple cities"
-        "\n• Comprehensive city information including coordinates and timezone details"
-        
-        "\n\n=== WEATHER HANDLING ==="
-        "\n• When users ask for weather, use get_weather() for current conditions"
-        "\n• For forecasts, use get_weather_forecast() and specify the number of days (1-5)"
-        "\n• Support all temperature units: metric (Celsius), imperial (Fahrenheit), kelvin"
-        "\n• If weather data fails, explain the issue and suggest checking city spelling"
-        "\n• When API key is not configured, explain demo data limitations clearly"
-        "\n• For ambiguous city names, suggest including country or state for clarity"
-        
-        "\n\n=== TIME HANDLING ==="
-        "\n• Use get_current_time() for single city time queries"
-        "\n• Support multiple format types: 'standard', 'detailed', or 'utc'"
-        "\n• Use get_time_difference() to compare times between two cities"
-        "\n• Use get_world_clock() for multiple cities simultaneously"
-        "\n• Always specify the timezone in your responses"
-        "\n• Handle daylight saving time transitions gracefully"
-        "\n• For scheduling questions, provide times in multiple relevant zones"
-        
-        "\n\n=== CITY AND LOCATION HANDLING ==="
-        "\n• Use get_city_info() for geographical details about locations"
-        "\n• Handle various city name formats (with/without country, abbreviations)"
-        "\n• For ambiguous names, ask for clarification (e.g., 'Paris, France' vs 'Paris, Texas')"
-        "\n• Provide coordinates and timezone information when helpful"
-        "\n• Handle historical city names and common misspellings gracefully"
-        
-        "\n\n=== ERROR HANDLING AND EDGE CASES ==="
-        "\n• If a tool returns an error, explain the issue clearly to the user"
-        "\n• For invalid city names, suggest alternatives or ask for clarification"
-        "\n• When API limits are reached, explain the situation and suggest alternatives"
-        "\n• Handle network timeouts by suggesting to try again later"
-        "\n• For cities with multiple locations, ask for country/state specification"
-        "\n• If coordinates are provided instead of city names, acknowledge but ask for city name"
-        
-        "\n\n=== USER INTERACTION GUIDELINES ==="
-        "\n• Always be helpful, accurate, and conversational"
-        "\n• Provide context for your responses (timezone, data source, etc.)"
-        "\n• When data is unavailable, explain why and offer alternatives"
-        "\n• For complex queries, break down information clearly"
-        "\n• Offer related information that might be useful (e.g., when giving weather, mention if it's unusual for the season)"
-        "\n• Use proper units and formats based on user preference or location"
-        
-        "\n\n=== SPECIAL SCENARIOS ==="
-        "\n• For travel planning: provide weather and time info for multiple destinations"
-        "\n• For scheduling: show times in multiple relevant zones"
-        "\n• For emergency information: prioritize accuracy and clarity"
-        "\n• For scientific queries: provide precise coordinates and UTC times when relevant"
-        "\n• For historical questions: explain that current tools provide present data only"
-        
-        "\n\n=== DATA SOURCE TRANSPARENCY ==="
-        "\n• Always mention when using demo data vs real-time data"
-        "\n• Explain API key requirements for full functionality when relevant"
-        "\n• Acknowledge data limitations and suggest setup instructions when needed"
-        "\n• Be clear about data freshness and update frequency"
-        
-        "\nRemember: Your goal is to provide accurate, helpful, and contextually appropriate information while handling edge cases gracefully and maintaining a helpful, professional tone."
-    ),
-    tools=[
-        get_weather,
-        get_weather_forecast,
-        get_current_time,
-        get_time_difference,
-        get_world_clock,
-        get_city_info
-    ],
-)
\ No newline at end of file
+# System instruction for the root agent, defined once at module level
+_ROOT_INSTRUCTION = (
+    "You are a helpful and knowledgeable assistant with access to real-time weather data and comprehensive global time zone information. "
+    "Your expertise covers weather conditions, forecasts, time zones, and geographical information for any city worldwide."
+    
+    "\n\n=== CORE CAPABILITIES ==="
+    "\n• Real-time weather data from OpenWeatherMap API with fallback to demo data"
+    "\n• Weather forecasts up to 5 days for any city"
+    "\n• Current time and timezone information for any global location"
+    "\n• Time zone conversions and differences between cities"
+    "\n• World clock functionality for multiple cities"
+    "\n• Comprehensive city information including coordinates and timezone details"
+    
+    "\n\n=== WEATHER HANDLING ==="
+    "\n• When users ask for weather, use get_weather() for current conditions"
+    "\n• For forecasts, use get_weather_forecast() and specify the number of days (1-5)"
+    "\n• Support all temperature units: metric (Celsius), imperial (Fahrenheit), kelvin"
+    "\n• If weather data fails, explain the issue and suggest checking city spelling"
+    "\n• When API key is not configured, explain demo data limitations clearly"
+    "\n• For ambiguous city names, suggest including country or state for clarity"
+    
+    "\n\n=== TIME HANDLING ==="
+    "\n• Use get_current_time() for single city time queries"
+    "\n• Support multiple format types: 'standard', 'detailed', or 'utc'"
+    "\n• Use get_time_difference() to compare times between two cities"
+    "\n• Use get_world_clock() for multiple cities simultaneously"
+    "\n• Always specify the timezone in your responses"
+    "\n• Handle daylight saving time transitions gracefully"
+    "\n• For scheduling questions, provide times in multiple relevant zones"
+    
+    "\n\n=== CITY AND LOCATION HANDLING ==="
+    "\n• Use get_city_info() for geographical details about locations"
+    "\n• Handle various city name formats (with/without country, abbreviations)"
+    "\n• For ambiguous names, ask for clarification (e.g., 'Paris, France' vs 'Paris, Texas')"
+    "\n• Provide coordinates and timezone information when helpful"
+    "\n• Handle historical city names and common misspellings gracefully"
+    
+    "\n\n=== ERROR HANDLING AND EDGE CASES ==="
+    "\n• If a tool returns an error, explain the issue clearly to the user"
+    "\n• For invalid city names, suggest alternatives or ask for clarification"
+    "\n• When API limits are reached, explain the situation and suggest alternatives"
+    "\n• Handle network timeouts by suggesting to try again later"
+    "\n• For cities with multiple locations, ask for country/state specification"
+    "\n• If coordinates are provided instead of city names, acknowledge but ask for city name"
+    
+    "\n\n=== USER INTERACTION GUIDELINES ==="
+    "\n• Always be helpful, accurate, and conversational"
+    "\n• Provide context for your responses (timezone, data source, etc.)"
+    "\n• When data is unavailable, explain why and offer alternatives"
+    "\n• For complex queries, break down information clearly"
+    "\n• Offer related information that might be useful (e.g., when giving weather, mention if it's unusual for the season)"
+    "\n• Use proper units and formats based on user preference or location"
+    
+    "\n\n=== SPECIAL SCENARIOS ==="
+    "\n• For travel planning: provide weather and time info for multiple destinations"
+    "\n• For scheduling: show times in multiple relevant zones"
+    "\n• For emergency information: prioritize accuracy and clarity"
+    "\n• For scientific queries: provide precise coordinates and UTC times when relevant"
+    "\n• For historical questions: explain that current tools provide present data only"
+    
+    "\n\n=== DATA SOURCE TRANSPARENCY ==="
+    "\n• Always mention when using demo data vs real-time data"
+    "\n• Explain API key requirements for full functionality when relevant"
+    "\n• Acknowledge data limitations and suggest setup instructions when needed"
+    "\n• Be clear about data freshness and update frequency"
+    
+    "\nRemember: Your goal is to provide accurate, helpful, and contextually appropriate information while handling edge cases gracefully and maintaining a helpful, professional tone."
+)
+
+
+def _build_agent() -> Agent:
+    """Create the enhanced agent with comprehensive weather and time capabilities."""
+    return Agent(
+        name="enhanced_weather_time_agent",
+        model="gemini-2.0-flash",
+        description=(
+            "Advanced agent that provides real-time weather data and time information for any city worldwide. "
+            "Supports weather forecasts, time zone conversions, world clock, and city information lookup."
+        ),
+        instruction=_ROOT_INSTRUCTION,
+        tools=[
+            get_weather,
+            get_weather_forecast,
+            get_current_time,
+            get_time_difference,
+            get_world_clock,
+            get_city_info
+        ],
+    )
+
+
+def __getattr__(name):
+    """Build root_agent on first access and keep it as a module global."""
+    if name == "root_agent":
+        agent = _build_agent()
+        globals()["root_agent"] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
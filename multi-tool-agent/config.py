@@ -1,5 +1,6 @@
 """Configuration settings for the multi-tool agent."""
 
+import logging
 import os
 from pathlib import Path
 from typing import Optional
@@ -15,6 +16,16 @@ if env_file.exists():
 else:
     load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure root logging for scripts and apps that run the agent directly.
+
+    Library modules only create loggers; call this from an entry point when
+    no other logging configuration is in place.
+    """
+    logging.basicConfig(level=level)
+
 class Config:
     """Configuration class for API keys and settings."""
     
@@ -28,16 +39,36 @@ class Config:
     DEFAULT_UNITS = "metric"  # metric, imperial, or kelvin
     DEFAULT_LANGUAGE = "en"
     
+    # Nominatim geocoding server; point this at a self-hosted instance to avoid the public usage limits
+    NOMINATIM_URL = os.getenv('NOMINATIM_URL', 'https://nominatim.openstreetmap.org')
+    # Minimum seconds between Nominatim requests (the public instance allows at most 1 per second)
+    NOMINATIM_MIN_INTERVAL = float(os.getenv('NOMINATIM_MIN_INTERVAL', '1.0'))
+    
+    # Persistent geocoding cache (used when the optional diskcache package is installed)
+    GEOCODE_CACHE_DIR = os.path.expanduser(
+        os.getenv('GEOCODE_CACHE_DIR', '~/.cache/multi_tool_agent/geo')
+    )
+    GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60  # 30 days
+    
+    # Result of the first validate_config() call, reused on later calls
+    _validated: Optional[bool] = None
+    
     @classmethod
     def validate_config(cls) -> bool:
         """Validate that required configuration is present."""
+        if cls._validated is not None:
+            return cls._validated
+        
         if not cls.OPENWEATHER_API_KEY:
-            print("Warning: OPENWEATHER_API_KEY not found in environment variables or .env file.")
-            print("To get real-time weather data, please:")
-            print("1. Sign up for a free API key at https://openweathermap.org/api")
-            print("2. Add OPENWEATHER_API_KEY=your_api_key to your .env file")
-            print("   or set the environment variable: export OPENWEATHER_API_KEY='your_api_key'")
-            return False
+            logger.warning(
+                "OPENWEATHER_API_KEY not found in environment variables or .env file. "
+                "To get real-time weather data, sign up for a free API key at "
+                "https://openweathermap.org/api and add OPENWEATHER_API_KEY=your_api_key "
+                "to your .env file, or set the environment variable: "
+                "export OPENWEATHER_API_KEY='your_api_key'"
+            )
+            cls._validated = False
         else:
-            print(f"OpenWeatherMap API key loaded successfully from .env file")
-            return True
+            logger.info("OpenWeatherMap API key loaded successfully from .env file")
+            cls._validated = True
+        return cls._validated
@@ -0,0 +1,185 @@
+"""Asynchronous weather service for fetching many cities concurrently."""
+
+import asyncio
+import copy
+import logging
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+
+import aiohttp
+
+# Handle both relative and absolute imports
+try:
+    from .weather import WeatherService, weather_service, FORECAST_REQUIRES_API_KEY_ERROR, canonical_city
+except ImportError:
+    from services.weather import WeatherService, weather_service, FORECAST_REQUIRES_API_KEY_ERROR, canonical_city
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class AsyncWeatherService:
+    """aiohttp-based OpenWeatherMap client that overlaps requests on one event loop.
+    
+    Request parameters, response validation, formatting and the TTL response
+    cache are delegated to a WeatherService so both clients return identical
+    payloads and share cached results. The aiohttp
+    session is created on first use inside the running event loop; call
+    close() (or use ``async with``) when done.
+    """
+    
+    def __init__(self, service: Optional[WeatherService] = None):
+        self._service = service or weather_service
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Fetches in progress by cache key, so concurrent misses share one request
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+    
+    async def __aenter__(self) -> "AsyncWeatherService":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                # Resolved addresses are reused for 5 minutes so reconnects skip DNS
+                connector=aiohttp.TCPConnector(
+                    limit=50,
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the aiohttp session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Make an asynchronous request to the OpenWeatherMap API.
+        
+        Args:
+            endpoint (str): API endpoint
+            params (Dict[str, Any]): Request parameters
+            
+        Returns:
+            Optional[Dict[str, Any]]: API response or None if failed
+        """
+        if not self._service.has_api_key:
+            return None
+        
+        url = self._service.request_url(endpoint)
+        
+        try:
+            async with self._get_session().get(url, params=self._service.request_params(params)) as response:
+                response.raise_for_status()
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error("API request failed: %s", e)
+            return None
+    
+    async def _coalesce(self, key: tuple, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run fetch for a cache key, sharing its result with concurrent callers.
+        
+        The first caller for a key runs fetch; callers arriving while it is in
+        flight wait for its result. If that fetch fails or is cancelled, the
+        waiters run fetch themselves rather than inheriting the failure.
+        
+        Args:
+            key (tuple): Response cache key
+            fetch (Callable): Coroutine function that fetches and caches the response
+            
+        Returns:
+            Dict[str, Any]: Tool response
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            # shield() keeps a cancelled waiter from cancelling the shared future
+            result = await asyncio.shield(future)
+            if result is not None:
+                return copy.deepcopy(result)
+            return await fetch()
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            result = await fetch()
+            return result
+        finally:
+            del self._inflight[key]
+            # Waiters copy a private snapshot, never the dict handed to this caller;
+            # None tells them the fetch failed or was cancelled
+            future.set_result(copy.deepcopy(result))
+    
+    async def get_current_weather(self, city: str, units: str = "metric") -> Dict[str, Any]:
+        """
+        Get current weather data for a city.
+        
+        Args:
+            city (str): City name
+            units (str): Temperature units (metric, imperial, kelvin)
+            
+        Returns:
+            Dict[str, Any]: Weather data with status
+        """
+        city_norm, city_query, city_display = canonical_city(city)
+        if not self._service.has_api_key:
+            return self._service.get_mock_weather(city_norm, city_display)
+        
+        key = ('weather', city_norm, units)
+        cached = self._service.cached_weather(city_norm, units)
+        if cached is not None:
+            return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            data = await self._make_api_request('weather', self._service.weather_params(city_query, units))
+            return self._service.weather_result(data, city_norm, city_display, units)
+        
+        return await self._coalesce(key, fetch)
+    
+    async def get_weather_forecast(self, city: str, units: str = "metric", days: int = 5) -> Dict[str, Any]:
+        """
+        Get weather forecast for a city.
+        
+        Args:
+            city (str): City name
+            units (str): Temperature units
+            days (int): Number of days (max 5 for free tier)
+            
+        Returns:
+            Dict[str, Any]: Forecast data with status
+        """
+        if not self._service.has_api_key:
+            return dict(FORECAST_REQUIRES_API_KEY_ERROR)
+        
+        city_norm, city_query, city_display = canonical_city(city)
+        key = ('forecast', city_norm, units, days)
+        cached = self._service.cached_forecast(city_norm, units, days)
+        if cached is not None:
+            return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            data = await self._make_api_request('forecast', self._service.forecast_params(city_query, units, days))
+            return self._service.forecast_result(data, city_norm, city_display, units, days)
+        
+        return await self._coalesce(key, fetch)
+    
+    async def get_current_weather_many(self, cities: List[str], units: str = "metric") -> List[Dict[str, Any]]:
+        """
+        Get current weather for several cities concurrently.
+        
+        Args:
+            cities (List[str]): City names
+            units (str): Temperature units (metric, imperial, kelvin)
+            
+        Returns:
+            List[Dict[str, Any]]: Weather data with status, in the same order as cities
+        """
+        return list(await asyncio.gather(*(self.get_current_weather(city, units) for city in cities)))
@@ -1,17 +1,29 @@
 """Time service module for handling time queries across different cities."""
 
 import datetime
-import pytz
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from typing import Dict, Any, Optional
 import logging
 
 try:
-    from .utils import location_utils
+    from .utils import location_utils, title_case
 except ImportError:
-    from services.utils import location_utils
+    from services.utils import location_utils, title_case
 
 logger = logging.getLogger(__name__)
 
+_UTC = datetime.timezone.utc
+
+# English day names indexed by datetime.weekday(), matching strftime("%A") in the C locale
+_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def _fmt(dt: datetime.datetime) -> str:
+    """Format a datetime as 'YYYY-MM-DD HH:MM:SS' without going through strftime."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
 class TimeService:
     """Service for handling time-related queries for any city worldwide."""
     
@@ -40,11 +52,11 @@ class TimeService:
         
         try:
             # Get timezone object
-            tz = pytz.timezone(timezone_str)
+            tz = ZoneInfo(timezone_str)
             
-            # Get current time in the timezone
-            now = datetime.datetime.now(tz)
-            utc_now = datetime.datetime.now(pytz.UTC)
+            # Read the clock once and derive local time from it so both values match
+            utc_now = datetime.datetime.now(_UTC)
+            now = utc_now.astimezone(tz)
             
             # Format based on type
             if format_type == "detailed":
@@ -62,13 +74,13 @@ class TimeService:
                     "timezone": timezone_str,
                     "local_time": now.isoformat(),
                     "utc_time": utc_now.isoformat(),
-                    "formatted_time": now.strftime("%Y-%m-%d %H:%M:%S"),
-                    "day_of_week": now.strftime("%A"),
+                    "formatted_time": _fmt(now),
+                    "day_of_week": _DAYS[now.weekday()],
                     "utc_offset": now.strftime("%z")
                 }
             }
             
-        except pytz.exceptions.UnknownTimeZoneError:
+        except ZoneInfoNotFoundError:
             return {
                 "status": "error",
                 "error_message": f"Unknown timezone '{timezone_str}' for city '{city}'"
@@ -108,11 +120,11 @@ class TimeService:
             }
         
         try:
-            tz1 = pytz.timezone(tz1_str)
-            tz2 = pytz.timezone(tz2_str)
+            tz1 = ZoneInfo(tz1_str)
+            tz2 = ZoneInfo(tz2_str)
             
             # Get current time in both timezones
-            now_utc = datetime.datetime.now(pytz.UTC)
+            now_utc = datetime.datetime.now(_UTC)
             time1 = now_utc.astimezone(tz1)
             time2 = now_utc.astimezone(tz2)
             
@@ -122,11 +134,13 @@ class TimeService:
             difference = offset1 - offset2
             
             # Format the response
+            title1 = title_case(city1)
+            title2 = title_case(city2)
             if difference == 0:
-                report = f"{city1.title()} and {city2.title()} are in the same time zone."
+                report = f"{title1} and {title2} are in the same time zone."
             else:
-                ahead_city = city1.title() if difference > 0 else city2.title()
-                behind_city = city2.title() if difference > 0 else city1.title()
+                ahead_city = title1 if difference > 0 else title2
+                behind_city = title2 if difference > 0 else title1
                 hours_diff = abs(difference)
                 
                 if hours_diff == int(hours_diff):
@@ -138,8 +152,11 @@ class TimeService:
                 
                 report = f"{ahead_city} is {time_diff_str} ahead of {behind_city}."
             
-            report += f"\nCurrent time in {city1.title()}: {time1.strftime('%Y-%m-%d %H:%M:%S %Z')}"
-            report += f"\nCurrent time in {city2.title()}: {time2.strftime('%Y-%m-%d %H:%M:%S %Z')}"
+            report = "\n".join((
+                report,
+                f"Current time in {title1}: {time1.strftime('%Y-%m-%d %H:%M:%S %Z')}",
+                f"Current time in {title2}: {time2.strftime('%Y-%m-%d %H:%M:%S %Z')}"
+            ))
             
             return {
                 "status": "success",
@@ -181,18 +198,30 @@ class TimeService:
         results = []
         errors = []
         
-        for city in cities:
-            time_info = self.get_current_time(city)
-            if time_info["status"] == "success":
-                data = time_info["data"]
-                results.append({
-                    "city": city.title(),
-                    "time": data["formatted_time"],
-                    "timezone": data["timezone"],
-                    "day": data["day_of_week"]
-                })
-            else:
-                errors.append(f"{city}: {time_info['error_message']}")
+        # Cached lookups resolve in parallel; uncached ones are spaced out by the Nominatim rate limiter
+        with ThreadPoolExecutor(max_workers=min(8, len(cities))) as executor:
+            timezones = list(executor.map(self.location_utils.get_timezone, cities))
+        
+        # Take a single UTC reading so every city is reported for the same instant
+        now_utc = datetime.datetime.now(_UTC)
+        
+        for city, tz_str in zip(cities, timezones):
+            if not tz_str:
+                errors.append(f"{city}: Could not determine timezone for '{city}'. Please check the city name and try again.")
+                continue
+            
+            try:
+                local = now_utc.astimezone(ZoneInfo(tz_str))
+            except ZoneInfoNotFoundError:
+                errors.append(f"{city}: Unknown timezone '{tz_str}' for city '{city}'")
+                continue
+            
+            results.append({
+                "city": title_case(city),
+                "time": _fmt(local),
+                "timezone": tz_str,
+                "day": _DAYS[local.weekday()]
+            })
         
         if not results:
             return {
@@ -201,16 +230,16 @@ class TimeService:
             }
         
         # Format report
-        report = "World Clock:\n"
-        for result in results:
-            report += f"{result['city']}: {result['time']} ({result['day']})\n"
+        lines = ["World Clock:"]
+        lines.extend(f"{result['city']}: {result['time']} ({result['day']})" for result in results)
         
         if errors:
-            report += f"\nErrors: {'; '.join(errors)}"
+            lines.append("")
+            lines.append(f"Errors: {'; '.join(errors)}")
         
         return {
             "status": "success",
-            "report": report.strip(),
+            "report": "\n".join(lines),
             "data": {
                 "results": results,
                 "errors": errors,
@@ -219,27 +248,27 @@ class TimeService:
             }
         }
     
-    def _format_standard_time(self, city: str, now: datetime.datetime, tz: pytz.BaseTzInfo) -> str:
+    def _format_standard_time(self, city: str, now: datetime.datetime, tz: ZoneInfo) -> str:
         """Format time in standard format."""
-        return f"The current time in {city.title()} is {now.strftime('%Y-%m-%d %H:%M:%S')} ({tz.zone})"
+        return f"The current time in {title_case(city)} is {_fmt(now)} ({tz.key})"
     
-    def _format_detailed_time(self, city: str, now: datetime.datetime, tz: pytz.BaseTzInfo, utc_now: datetime.datetime) -> str:
+    def _format_detailed_time(self, city: str, now: datetime.datetime, tz: ZoneInfo, utc_now: datetime.datetime) -> str:
         """Format time with detailed information."""
         utc_offset = now.strftime("%z")
         utc_offset_formatted = f"UTC{utc_offset[:3]}:{utc_offset[3:]}" if utc_offset else "UTC"
         
-        return f"""Time information for {city.title()}:
+        return f"""Time information for {title_case(city)}:
 Local time: {now.strftime('%A, %B %d, %Y at %H:%M:%S')}
-Timezone: {tz.zone}
+Timezone: {tz.key}
 UTC offset: {utc_offset_formatted}
-UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S')}"""
+UTC time: {_fmt(utc_now)}"""
     
     def _format_utc_time(self, city: str, now: datetime.datetime, utc_now: datetime.datetime) -> str:
         """Format time with UTC comparison."""
         utc_offset = now.strftime("%z")
-        return f"""Time in {city.title()}:
-Local: {now.strftime('%Y-%m-%d %H:%M:%S')} ({utc_offset})
-UTC: {utc_now.strftime('%Y-%m-%d %H:%M:%S')}"""
+        return f"""Time in {title_case(city)}:
+Local: {_fmt(now)} ({utc_offset})
+UTC: {_fmt(utc_now)}"""
 
 # Global instance
 time_service = TimeService()
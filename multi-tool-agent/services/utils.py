@@ -1,21 +1,172 @@
 """Utility functions for the multi-tool agent."""
 
-import pytz
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
-from timezonefinder import TimezoneFinder
-from typing import Optional, Tuple, Dict, Any
+import requests
+import threading
+import time
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from typing import NamedTuple, Optional, Tuple, Dict, Any
 import logging
 
-logging.basicConfig(level=logging.INFO)
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    from ..config import Config
+except ImportError:
+    from config import Config
+
 logger = logging.getLogger(__name__)
 
+NOMINATIM_SEARCH_URL = f"{Config.NOMINATIM_URL.rstrip('/')}/search"
+
+# Spaces out Nominatim requests from all threads to honour the server's rate limit
+_nominatim_lock = threading.Lock()
+_nominatim_last_request = 0.0
+
+
+class GeocodeResult(NamedTuple):
+    """Coordinates and display address returned by a single geocoding lookup."""
+    latitude: float
+    longitude: float
+    address: str
+
+
+@lru_cache(maxsize=None)
+def _get_http_session() -> requests.Session:
+    """Create the shared HTTP session used for Nominatim lookups on first use."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "multi_tool_agent"})
+    return session
+
+
+@lru_cache(maxsize=None)
+def _get_disk_cache():
+    """Open the persistent geocoding cache, or return None if it is unavailable."""
+    if diskcache is None:
+        return None
+    try:
+        return diskcache.Cache(Config.GEOCODE_CACHE_DIR)
+    except Exception as e:
+        logger.warning(f"Persistent geocoding cache disabled: {e}")
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_timezone_finder():
+    """
+    Create the shared TimezoneFinder on first use.
+    
+    timezonefinder is imported here rather than at module level: TimezoneFinder
+    loads its polygon data on construction, which callers that never resolve a
+    location should not pay for.
+    """
+    from timezonefinder import TimezoneFinder
+    return TimezoneFinder()
+
+
+def _wait_for_nominatim_slot() -> None:
+    """Block until at least NOMINATIM_MIN_INTERVAL seconds have passed since the previous request."""
+    global _nominatim_last_request
+    with _nominatim_lock:
+        delay = _nominatim_last_request + Config.NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _nominatim_last_request = time.monotonic()
+
+
+def _fetch_geocode(city_key: str) -> Optional[GeocodeResult]:
+    """Query Nominatim for a city; request errors propagate to the caller."""
+    _wait_for_nominatim_slot()
+    response = _get_http_session().get(
+        NOMINATIM_SEARCH_URL,
+        params={"q": city_key, "format": "json", "limit": 1},
+        timeout=10
+    )
+    response.raise_for_status()
+    results = response.json()
+    if results:
+        location = results[0]
+        return GeocodeResult(float(location["lat"]), float(location["lon"]), location.get("display_name", ""))
+    return None
+
+
+@lru_cache(maxsize=2048)
+def _geocode(city_key: str) -> Optional[GeocodeResult]:
+    """
+    Geocode a normalized city name, memoized per process and on disk.
+    
+    Successful lookups are also stored in the persistent cache, when
+    available, so they survive process restarts. Persistent cache errors are
+    logged and ignored. Geocoder errors propagate to the caller and are
+    therefore never cached.
+    
+    Args:
+        city_key (str): Stripped, lower-cased city name
+        
+    Returns:
+        Optional[GeocodeResult]: Coordinates and address, or None if not found
+    """
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        # A locked database or corrupt entry must not fail the lookup; fall through to the network
+        try:
+            cached = disk_cache.get(city_key)
+            if cached is not None:
+                return GeocodeResult(*cached)
+        except Exception as e:
+            logger.warning(f"Persistent geocoding cache read failed for '{city_key}': {e}")
+    
+    result = _fetch_geocode(city_key)
+    if result and disk_cache is not None:
+        try:
+            # Store a plain tuple so entries do not depend on this module's import path
+            disk_cache.set(city_key, tuple(result), expire=Config.GEOCODE_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Persistent geocoding cache write failed for '{city_key}': {e}")
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _timezone_at(lat: float, lon: float) -> Optional[str]:
+    """Look up the timezone for coordinates already rounded to ~100 m."""
+    return _get_timezone_finder().timezone_at(lat=lat, lng=lon)
+
+
+@lru_cache(maxsize=4096)
+def title_case(text: str) -> str:
+    """Return str.title() of a city name, memoized since the same names recur."""
+    return text.title()
+
+
+def _city_key(city: str) -> str:
+    """Normalize a city name into a cache key."""
+    return city.strip().lower()
+
+
 class LocationUtils:
     """Utilities for handling location-based operations."""
     
-    def __init__(self):
-        self.geolocator = Nominatim(user_agent="multi_tool_agent")
-        self.tf = TimezoneFinder()
+    @property
+    def session(self) -> requests.Session:
+        """Shared HTTP session for geocoding, created on first access."""
+        return _get_http_session()
+    
+    @property
+    def tf(self):
+        """Shared TimezoneFinder, created on first access."""
+        return _get_timezone_finder()
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all memoized geocoding and timezone lookups, including the persistent cache."""
+        _geocode.cache_clear()
+        _timezone_at.cache_clear()
+        disk_cache = _get_disk_cache()
+        if disk_cache is not None:
+            disk_cache.clear()
     
     def get_coordinates(self, city: str) -> Optional[Tuple[float, float]]:
         """
@@ -28,11 +179,11 @@ class LocationUtils:
             Optional[Tuple[float, float]]: (latitude, longitude) or None if not found
         """
         try:
-            location = self.geolocator.geocode(city, timeout=10)
-            if location:
-                return (location.latitude, location.longitude)
+            result = _geocode(_city_key(city))
+            if result:
+                return (result.latitude, result.longitude)
             return None
-        except (GeocoderTimedOut, GeocoderUnavailable) as e:
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
             logger.error(f"Geocoding error for {city}: {e}")
             return None
     
@@ -49,8 +200,7 @@ class LocationUtils:
         coordinates = self.get_coordinates(city)
         if coordinates:
             lat, lon = coordinates
-            timezone_str = self.tf.timezone_at(lat=lat, lng=lon)
-            return timezone_str
+            return _timezone_at(round(lat, 3), round(lon, 3))
         return None
     
     def validate_timezone(self, timezone_str: str) -> bool:
@@ -64,9 +214,9 @@ class LocationUtils:
             bool: True if valid, False otherwise
         """
         try:
-            pytz.timezone(timezone_str)
+            ZoneInfo(timezone_str)
             return True
-        except pytz.exceptions.UnknownTimeZoneError:
+        except (ZoneInfoNotFoundError, ValueError):
             return False
     
     def get_city_info(self, city: str) -> Dict[str, Any]:
@@ -79,39 +229,31 @@ class LocationUtils:
         Returns:
             Dict[str, Any]: City information including coordinates, timezone, etc.
         """
-        coordinates = self.get_coordinates(city)
-        if not coordinates:
+        try:
+            result = _geocode(_city_key(city))
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            logger.error(f"Geocoding error for {city}: {e}")
+            result = None
+        
+        if not result:
             return {
                 "success": False,
                 "error": f"Could not find location information for '{city}'"
             }
         
-        lat, lon = coordinates
-        timezone_str = self.tf.timezone_at(lat=lat, lng=lon)
+        # The geocode result already carries the address, so no second lookup is needed
+        timezone_str = _timezone_at(round(result.latitude, 3), round(result.longitude, 3))
+        address_parts = result.address.split(", ") if result.address else []
         
-        try:
-            location = self.geolocator.geocode(city, timeout=10)
-            address_parts = location.address.split(", ") if location else []
-            
-            return {
-                "success": True,
-                "city": city,
-                "latitude": lat,
-                "longitude": lon,
-                "timezone": timezone_str,
-                "full_address": location.address if location else "",
-                "country": address_parts[-1] if address_parts else "Unknown"
-            }
-        except Exception as e:
-            return {
-                "success": True,
-                "city": city,
-                "latitude": lat,
-                "longitude": lon,
-                "timezone": timezone_str,
-                "full_address": "",
-                "country": "Unknown"
-            }
+        return {
+            "success": True,
+            "city": city,
+            "latitude": result.latitude,
+            "longitude": result.longitude,
+            "timezone": timezone_str,
+            "full_address": result.address or "",
+            "country": address_parts[-1] if address_parts else "Unknown"
+        }
 
 # Global instance for reuse
 location_utils = LocationUtils()
@@ -1,27 +1,299 @@
 """Weather service module for real-time weather data."""
 
+import atexit
+import copy
 import requests
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from urllib3.util.retry import Retry
+
+# Prefer orjson for parsing API payloads; fall back to the standard library
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 # Handle both relative and absolute imports
 try:
     from ..config import Config
-    from .utils import location_utils
+    from .utils import location_utils, title_case
 except ImportError:
     from config import Config
-    from services.utils import location_utils
+    from services.utils import location_utils, title_case
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Returned by _send_request when the server answers 304 to a conditional GET
+NOT_MODIFIED = object()
+
+FORECAST_REQUIRES_API_KEY_ERROR = {
+    "status": "error",
+    "error_message": "Weather forecast requires an API key. Please set OPENWEATHER_API_KEY environment variable to get forecasts, or use get_weather() for current conditions with demo data."
+}
+
+def canonical_city(city: str) -> Tuple[str, str, str]:
+    """
+    Canonicalize a city name once at the API boundary of either weather client.
+    
+    Only lookup keys are casefolded: casefolding rewrites some non-ASCII
+    names (e.g. "Gießen" -> "giessen"), so the API query and display form
+    keep the caller's spelling.
+    
+    Args:
+        city (str): City name as supplied by the caller
+        
+    Returns:
+        Tuple[str, str, str]: (city_norm, city_query, city_display) - the
+        casefolded key used for caching, city IDs and demo data, the stripped
+        name sent to the API, and its title-cased display form
+    """
+    city_query = city.strip()
+    return city_query.casefold(), city_query, title_case(city_query)
+
+# Simple mock data for demonstration, keyed by casefolded city name
+_MOCK_WEATHER: Dict[str, Dict[str, Any]] = {
+    "new york": {
+        "temp": 22.5,
+        "condition": "partly cloudy",
+        "humidity": 65,
+        "wind_speed": 3.2
+    },
+    "london": {
+        "temp": 15.8,
+        "condition": "overcast",
+        "humidity": 78,
+        "wind_speed": 2.1
+    },
+    "lagos": {
+        "temp": 31.3,
+        "condition": "sunny",
+        "humidity": 55,
+        "wind_speed": 1.8
+    },
+    "paris": {
+        "temp": 18.7,
+        "condition": "light rain",
+        "humidity": 82,
+        "wind_speed": 2.5
+    },
+    "sydney": {
+        "temp": 24.1,
+        "condition": "clear sky",
+        "humidity": 60,
+        "wind_speed": 4.1
+    }
+}
+
+# Demo reports are constant, so format them once at import time
+_MOCK_REPORTS: Dict[str, str] = {
+    city: f"""Current weather in {title_case(city)} (Demo Data):
+Temperature: {data['temp']:.1f}°C
+Condition: {data['condition'].title()}
+Humidity: {data['humidity']}%
+Wind: {data['wind_speed']:.1f} m/s
+Note: This is demo data. Set OPENWEATHER_API_KEY for real-time data."""
+    for city, data in _MOCK_WEATHER.items()
+}
+
+_WEATHER_REPORT_TMPL = (
+    "Current weather in {city}:\n"
+    "Temperature: {temp:.1f}°{tu} (feels like {feels:.1f}°{tu})\n"
+    "Condition: {condition}\n"
+    "Humidity: {humidity}%\n"
+    "Wind: {wind:.1f} {su}"
+)
+
+# Title-case each name on its own; title() on the joined string mishandles names with apostrophes
+_MOCK_SUPPORTED = ', '.join(title_case(city) for city in _MOCK_WEATHER)
+
+class _InFlightRequest:
+    """A fetch in progress that concurrent callers for the same key wait on."""
+    
+    __slots__ = ('done', 'result')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
 class WeatherService:
     """Service for fetching real-time weather data from OpenWeatherMap API."""
     
+    # Seconds a successful response stays fresh in the in-process cache
+    _WEATHER_TTL = 600
+    _FORECAST_TTL = 3600
+    # Maximum number of cached responses (and learned city IDs) before least recently used are evicted
+    _CACHE_SIZE = 1024
+    
+    # Maximum number of city IDs the OpenWeatherMap group endpoint accepts per call
+    _GROUP_LIMIT = 20
+    
+    # Unit symbols for each supported units system
+    _TEMP_UNITS = {'metric': 'C', 'imperial': 'F', 'kelvin': 'K'}
+    _SPEED_UNITS = {'metric': 'm/s', 'imperial': 'mph', 'kelvin': 'm/s'}
+    
     def __init__(self):
         self.api_key = Config.OPENWEATHER_API_KEY
         self.base_url = Config.OPENWEATHER_BASE_URL
         self.has_api_key = bool(self.api_key)
+        
+        # Full URLs for the endpoints in use, built once
+        self._endpoints = {
+            name: f"{self.base_url}/{name}"
+            for name in ('weather', 'forecast', 'group', 'onecall')
+        }
+        
+        # Persistent session so repeated calls reuse pooled keep-alive connections
+        self._session = requests.Session()
+        # Ask for compressed payloads; requests decodes gzip/deflate transparently
+        self._session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'ai-weather-time-agent/2.0.0',
+            'Connection': 'keep-alive'
+        })
+        # Parameters sent with every request; requests merges them into each call
+        self._default_params = {'appid': self.api_key, 'lang': Config.DEFAULT_LANGUAGE}
+        self._session.params = self._default_params
+        # Retry idempotent GETs on transient failures; urllib3 logs each retry at DEBUG.
+        # Stalled reads are not retried and connect retries are capped so the worst
+        # case stays within the 10 s read timeout (2 x 3.05 s connect attempts).
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=2,
+                connect=1,
+                read=0,
+                status=2,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                # A long Retry-After on 429 would otherwise block the caller far past the budget
+                respect_retry_after_header=False
+            )
+        ))
+        
+        # LRU cache of successful responses: key -> (stored_at, etag, response)
+        self._weather_cache: "OrderedDict[tuple, Tuple[float, Optional[str], Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Fetches in progress by cache key, so concurrent misses share one request
+        self._inflight: Dict[tuple, _InFlightRequest] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # LRU map of OpenWeatherMap city IDs learned from earlier responses:
+        # casefolded name -> id, bounded like the response cache and guarded by its lock
+        self._city_id_cache: "OrderedDict[str, int]" = OrderedDict()
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+    
+    # The methods below let other transports (see AsyncWeatherService) share
+    # this service's request building, response handling and cache.
+    
+    def request_url(self, endpoint: str) -> str:
+        """Return the full URL for an API endpoint."""
+        return self._endpoints.get(endpoint) or f"{self.base_url}/{endpoint}"
+    
+    def request_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return params merged over the parameters sent with every request (API key, language)."""
+        return {**self._default_params, **params}
+    
+    def cached_weather(self, city_norm: str, units: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached current weather response, or None."""
+        return self._cache_get(('weather', city_norm, units), self._WEATHER_TTL)
+    
+    def cached_forecast(self, city_norm: str, units: str, days: int) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached forecast response, or None."""
+        return self._cache_get(('forecast', city_norm, units, days), self._FORECAST_TTL)
+    
+    def weather_result(self, data: Optional[Dict[str, Any]], city_norm: str, city_display: str, units: str) -> Dict[str, Any]:
+        """Turn a current weather API payload (or None on failure) into a tool response, caching it on success."""
+        result = self._handle_weather_data(data, city_norm, city_display, units)
+        self._cache_put(('weather', city_norm, units), result)
+        return result
+    
+    def forecast_result(self, data: Optional[Dict[str, Any]], city_norm: str, city_display: str, units: str, days: int) -> Dict[str, Any]:
+        """Turn a forecast API payload (or None on failure) into a tool response, caching it on success."""
+        result = self._handle_forecast_data(data, city_display, units, days)
+        self._cache_put(('forecast', city_norm, units, days), result)
+        return result
+    
+    def _cache_get(self, key: tuple, ttl: float) -> Optional[Dict[str, Any]]:
+        """
+        Return a copy of a cached response if it is younger than ttl seconds.
+        
+        The copy's cache_control max_age is lowered to the entry's remaining
+        lifetime, so downstream caches never hold it past the TTL.
+        """
+        with self._cache_lock:
+            entry = self._weather_cache.get(key)
+            if entry is None:
+                return None
+            age = time.monotonic() - entry[0]
+            if age >= ttl:
+                # Stale entries with an ETag are kept so they can be revalidated
+                if entry[1] is None:
+                    del self._weather_cache[key]
+                return None
+            self._weather_cache.move_to_end(key)
+            # Hand out a copy so callers that modify their response cannot alter the cache
+            result = copy.deepcopy(entry[2])
+        
+        cache_control = result.get("data", {}).get("cache_control")
+        if cache_control is not None:
+            cache_control["max_age"] = int(ttl - age)
+        return result
+    
+    def _cache_etag(self, key: tuple) -> Optional[str]:
+        """Return the ETag stored with a cached response, fresh or stale."""
+        with self._cache_lock:
+            entry = self._weather_cache.get(key)
+            return entry[1] if entry else None
+    
+    def _cache_refresh(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Restart the TTL of a cached response after a 304 and return it."""
+        with self._cache_lock:
+            entry = self._weather_cache.get(key)
+            if entry is None:
+                return None
+            self._weather_cache[key] = (time.monotonic(), entry[1], entry[2])
+            self._weather_cache.move_to_end(key)
+            return copy.deepcopy(entry[2])
+    
+    def _cache_put(self, key: tuple, result: Dict[str, Any], etag: Optional[str] = None) -> None:
+        """Store a successful response, evicting the least recently used entry when full."""
+        if result.get("status") != "success":
+            return
+        # Store a private copy; the caller keeps and may modify the original
+        result = copy.deepcopy(result)
+        with self._cache_lock:
+            self._weather_cache[key] = (time.monotonic(), etag, result)
+            self._weather_cache.move_to_end(key)
+            if len(self._weather_cache) > self._CACHE_SIZE:
+                self._weather_cache.popitem(last=False)
+    
+    def _city_id_get(self, city_norm: str) -> Optional[int]:
+        """Return the learned city ID for a casefolded name, or None."""
+        with self._cache_lock:
+            city_id = self._city_id_cache.get(city_norm)
+            if city_id is not None:
+                self._city_id_cache.move_to_end(city_norm)
+            return city_id
+    
+    def _city_id_put(self, city_norm: str, city_id: int) -> None:
+        """Remember a city ID, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._city_id_cache[city_norm] = city_id
+            self._city_id_cache.move_to_end(city_norm)
+            if len(self._city_id_cache) > self._CACHE_SIZE:
+                self._city_id_cache.popitem(last=False)
     
     def _make_api_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -34,19 +306,101 @@ class WeatherService:
         Returns:
             Optional[Dict[str, Any]]: API response or None if failed
         """
-        if not self.has_api_key:
-            return None
+        return self._send_request(endpoint, params)[0]
+    
+    def _send_request(self, endpoint: str, params: Dict[str, Any], etag: Optional[str] = None) -> Tuple[Any, Optional[str]]:
+        """
+        Make a request to the OpenWeatherMap API, optionally as a conditional GET.
+        
+        Args:
+            endpoint (str): API endpoint
+            params (Dict[str, Any]): Request parameters
+            etag (Optional[str]): ETag of a cached response to send as If-None-Match
             
-        params['appid'] = self.api_key
-        url = f"{self.base_url}/{endpoint}"
+        Returns:
+            Tuple[Any, Optional[str]]: The API response (NOT_MODIFIED on 304, None if failed) and its ETag
+        """
+        if not self.has_api_key:
+            return None, None
+        
+        url = self.request_url(endpoint)
+        headers = {'If-None-Match': etag} if etag else None
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, headers=headers, timeout=(3.05, 10))
+            if response.status_code == 304:
+                return NOT_MODIFIED, etag
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return None
+            return _json_loads(response.content), response.headers.get('ETag')
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("API request failed: %s", e)
+            return None, None
+    
+    def _fetch_cached(
+        self,
+        key: tuple,
+        endpoint: str,
+        params: Dict[str, Any],
+        handle: Callable[[Any], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Fetch an endpoint, revalidating a stale cached response with its ETag.
+        
+        Concurrent calls for the same key are coalesced: the first caller makes
+        the request and the others wait for its response. If that request
+        raises, the waiters fetch for themselves.
+        
+        Args:
+            key (tuple): Response cache key
+            endpoint (str): API endpoint
+            params (Dict[str, Any]): Request parameters
+            handle (Callable): Turns the API payload (or None on failure) into a tool response
+            
+        Returns:
+            Dict[str, Any]: Tool response, cached when successful
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = self._inflight[key] = _InFlightRequest()
+        
+        if not is_leader:
+            # Another thread is already fetching this key; share its response
+            inflight.done.wait()
+            if inflight.result is not None:
+                return copy.deepcopy(inflight.result)
+            return self._fetch_and_cache(key, endpoint, params, handle)
+        
+        try:
+            result = self._fetch_and_cache(key, endpoint, params, handle)
+            # Waiters copy a private snapshot, never the dict handed to this caller
+            inflight.result = copy.deepcopy(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            inflight.done.set()
+    
+    def _fetch_and_cache(
+        self,
+        key: tuple,
+        endpoint: str,
+        params: Dict[str, Any],
+        handle: Callable[[Any], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Fetch an endpoint and cache the tool response; see _fetch_cached."""
+        data, etag = self._send_request(endpoint, params, self._cache_etag(key))
+        if data is NOT_MODIFIED:
+            cached = self._cache_refresh(key)
+            if cached is not None:
+                return cached
+            # The entry was evicted while the request was in flight
+            data, etag = self._send_request(endpoint, params)
+        
+        result = handle(data)
+        self._cache_put(key, result, etag)
+        return result
     
     def get_current_weather(self, city: str, units: str = "metric") -> Dict[str, Any]:
         """
@@ -59,31 +413,121 @@ class WeatherService:
         Returns:
             Dict[str, Any]: Weather data with status
         """
+        city_norm, city_query, city_display = canonical_city(city)
         if not self.has_api_key:
-            return self._get_mock_weather(city)
+            return self.get_mock_weather(city_norm, city_display)
         
-        params = {
-            'q': city,
-            'units': units,
-            'lang': Config.DEFAULT_LANGUAGE
-        }
-        
-        data = self._make_api_request('weather', params)
+        key = ('weather', city_norm, units)
+        cached = self._cache_get(key, self._WEATHER_TTL)
+        if cached is not None:
+            return cached
         
+        return self._fetch_cached(
+            key, 'weather', self.weather_params(city_query, units),
+            lambda data: self._handle_weather_data(data, city_norm, city_display, units)
+        )
+    
+    def weather_params(self, city_query: str, units: str) -> Dict[str, Any]:
+        """Build query parameters for the current weather endpoint (OWM matches q case-insensitively)."""
+        return {
+            'q': city_query,
+            'units': units
+        }
+    
+    def _handle_weather_data(self, data: Optional[Dict[str, Any]], city_norm: str, city_display: str, units: str) -> Dict[str, Any]:
+        """Turn a current weather API payload (or None on failure) into a tool response."""
         if not data:
             return {
                 "status": "error",
-                "error_message": f"Failed to fetch weather data for '{city}'. Please check the city name and try again."
+                "error_message": f"Failed to fetch weather data for '{city_display}'. Please check the city name and try again."
             }
         
         # Check for API errors
         if data.get('cod') != 200:
             return {
                 "status": "error",
-                "error_message": data.get('message', f"Weather data not available for '{city}'")
+                "error_message": data.get('message', f"Weather data not available for '{city_display}'")
             }
         
-        return self._format_weather_response(data, city, units)
+        # Remember the city ID so later bulk lookups can use the group endpoint
+        if 'id' in data:
+            self._city_id_put(city_norm, data['id'])
+        
+        return self._format_weather_response(data, city_display, units)
+    
+    def get_current_weather_bulk(self, cities: List[str], units: str = "metric") -> List[Dict[str, Any]]:
+        """
+        Get current weather for several cities with as few API calls as possible.
+        
+        Cities whose OpenWeatherMap ID is already known are fetched together
+        through the group endpoint, up to 20 per request. The remaining
+        cities fall back to individual get_current_weather() calls, which
+        also record their IDs for next time.
+        
+        Args:
+            cities (List[str]): City names
+            units (str): Temperature units (metric, imperial, kelvin)
+            
+        Returns:
+            List[Dict[str, Any]]: Weather data with status, in the same order as cities
+        """
+        canonical = [canonical_city(city) for city in cities]
+        if not self.has_api_key:
+            return [self.get_mock_weather(city_norm, city_display) for city_norm, _, city_display in canonical]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(cities)
+        pending: Dict[int, List[int]] = {}  # city ID -> indexes into cities
+        
+        for index, (city_norm, _, _) in enumerate(canonical):
+            cached = self._cache_get(('weather', city_norm, units), self._WEATHER_TTL)
+            if cached is not None:
+                results[index] = cached
+                continue
+            
+            city_id = self._city_id_get(city_norm)
+            if city_id is not None:
+                pending.setdefault(city_id, []).append(index)
+        
+        city_ids = list(pending)
+        for start in range(0, len(city_ids), self._GROUP_LIMIT):
+            chunk = city_ids[start:start + self._GROUP_LIMIT]
+            data = self._make_api_request('group', {
+                'id': ','.join(map(str, chunk)),
+                'units': units
+            })
+            
+            for entry in (data or {}).get('list', []):
+                for index in pending.get(entry.get('id'), ()):
+                    city_norm, _, city_display = canonical[index]
+                    result = self._format_weather_response(entry, city_display, units)
+                    self._cache_put(('weather', city_norm, units), result)
+                    results[index] = result
+        
+        # Unknown IDs, failed group calls and cities missing from the group response
+        return [
+            result if result is not None else self.get_current_weather(city, units)
+            for city, result in zip(cities, results)
+        ]
+    
+    def get_current_weather_many(self, cities: List[str], units: str = "metric") -> List[Dict[str, Any]]:
+        """
+        Get current weather for several cities concurrently from synchronous code.
+        
+        The thread pool is deliberately short-lived; the persistent resource is
+        the session's connection pool, which is sized above the worker count.
+        
+        Args:
+            cities (List[str]): City names
+            units (str): Temperature units (metric, imperial, kelvin)
+            
+        Returns:
+            List[Dict[str, Any]]: Weather data with status, in the same order as cities
+        """
+        if not cities:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(cities))) as executor:
+            return list(executor.map(lambda city: self.get_current_weather(city, units), cities))
     
     def get_weather_forecast(self, city: str, units: str = "metric", days: int = 5) -> Dict[str, Any]:
         """
@@ -98,49 +542,63 @@ class WeatherService:
             Dict[str, Any]: Forecast data with status
         """
         if not self.has_api_key:
-            return {
-                "status": "error",
-                "error_message": "Weather forecast requires an API key. Please set OPENWEATHER_API_KEY environment variable to get forecasts, or use get_weather() for current conditions with demo data."
-            }
+            return dict(FORECAST_REQUIRES_API_KEY_ERROR)
         
-        params = {
-            'q': city,
+        city_norm, city_query, city_display = canonical_city(city)
+        key = ('forecast', city_norm, units, days)
+        cached = self._cache_get(key, self._FORECAST_TTL)
+        if cached is not None:
+            return cached
+        
+        return self._fetch_cached(
+            key, 'forecast', self.forecast_params(city_query, units, days),
+            lambda data: self._handle_forecast_data(data, city_display, units, days)
+        )
+    
+    def forecast_params(self, city_query: str, units: str, days: int) -> Dict[str, Any]:
+        """Build query parameters for the forecast endpoint."""
+        return {
+            'q': city_query,
             'units': units,
-            'lang': Config.DEFAULT_LANGUAGE,
             'cnt': min(days * 8, 40)  # 8 forecasts per day, max 40 for free tier
         }
-        
-        data = self._make_api_request('forecast', params)
-        
+    
+    def _handle_forecast_data(self, data: Optional[Dict[str, Any]], city_display: str, units: str, days: int) -> Dict[str, Any]:
+        """Turn a forecast API payload (or None on failure) into a tool response."""
         if not data or data.get('cod') != '200':
             return {
                 "status": "error",
-                "error_message": f"Failed to fetch forecast data for '{city}'"
+                "error_message": f"Failed to fetch forecast data for '{city_display}'"
             }
         
-        return self._format_forecast_response(data, city, units, days)
+        return self._format_forecast_response(data, city_display, units, days)
     
-    def _format_weather_response(self, data: Dict[str, Any], city: str, units: str) -> Dict[str, Any]:
+    def _format_weather_response(self, data: Dict[str, Any], city_display: str, units: str) -> Dict[str, Any]:
         """Format the weather API response into a readable format."""
         try:
             main = data['main']
             weather = data['weather'][0]
             wind = data.get('wind', {})
             
-            temp_unit = self._get_temperature_unit(units)
-            speed_unit = self._get_speed_unit(units)
-            
-            report = f"""Current weather in {city.title()}:
-Temperature: {main['temp']:.1f}°{temp_unit} (feels like {main['feels_like']:.1f}°{temp_unit})
-Condition: {weather['description'].title()}
-Humidity: {main['humidity']}%
-Wind: {wind.get('speed', 0):.1f} {speed_unit}"""
+            temp_unit = self._TEMP_UNITS.get(units, 'C')
+            speed_unit = self._SPEED_UNITS.get(units, 'm/s')
             
-            if 'visibility' in data:
-                report += f"\nVisibility: {data['visibility'] / 1000:.1f} km"
+            report = _WEATHER_REPORT_TMPL.format_map({
+                'city': city_display,
+                'temp': main['temp'],
+                'feels': main['feels_like'],
+                'tu': temp_unit,
+                'condition': weather['description'].title(),
+                'humidity': main['humidity'],
+                'wind': wind.get('speed', 0),
+                'su': speed_unit
+            })
             
-            if main.get('pressure'):
-                report += f"\nPressure: {main['pressure']} hPa"
+            # Optional lines are appended only when the API provided them
+            vis_line = f"\nVisibility: {data['visibility'] / 1000:.1f} km" if 'visibility' in data else ""
+            pres_line = f"\nPressure: {main['pressure']} hPa" if main.get('pressure') else ""
+            if vis_line or pres_line:
+                report = "".join((report, vis_line, pres_line))
             
             return {
                 "status": "success",
@@ -152,127 +610,81 @@ Wind: {wind.get('speed', 0):.1f} {speed_unit}"""
                     "humidity": main['humidity'],
                     "wind_speed": wind.get('speed', 0),
                     "pressure": main.get('pressure'),
-                    "units": units
+                    "units": units,
+                    # Freshness hint for an outer HTTP layer, e.g. "Cache-Control: public, max-age=N"
+                    "cache_control": {"max_age": self._WEATHER_TTL}
                 }
             }
         except (KeyError, IndexError) as e:
-            logger.error(f"Error formatting weather response: {e}")
+            logger.error("Error formatting weather response: %s", e)
             return {
                 "status": "error",
                 "error_message": "Failed to parse weather data"
             }
     
-    def _format_forecast_response(self, data: Dict[str, Any], city: str, units: str, days: int) -> Dict[str, Any]:
+    def _format_forecast_response(self, data: Dict[str, Any], city_display: str, units: str, days: int) -> Dict[str, Any]:
         """Format the forecast API response into a readable format."""
         try:
-            forecasts = data['list'][:days * 8:8]  # Take one forecast per day
-            temp_unit = self._get_temperature_unit(units)
+            # Take one 3-hourly entry per day, never more days than the API returned
+            raw = data['list']
+            day_count = min(days, (len(raw) + 7) // 8)
+            forecasts = [raw[i * 8] for i in range(day_count)]
+            temp_unit = self._TEMP_UNITS.get(units, 'C')
             
-            report = f"Weather forecast for {city.title()}:\n"
-            
-            for i, forecast in enumerate(forecasts):
-                date = forecast['dt_txt'].split(' ')[0]
-                temp = forecast['main']['temp']
-                condition = forecast['weather'][0]['description']
-                report += f"Day {i+1} ({date}): {temp:.1f}°{temp_unit}, {condition.title()}\n"
+            lines = [f"Weather forecast for {city_display}:"]
+            lines.extend(
+                f"Day {i+1} ({forecast['dt_txt'][:10]}): "
+                f"{forecast['main']['temp']:.1f}°{temp_unit}, {forecast['weather'][0]['description'].title()}"
+                for i, forecast in enumerate(forecasts)
+            )
             
             return {
                 "status": "success",
-                "report": report.strip(),
+                "report": "\n".join(lines),
                 "data": {
-                    "forecasts": forecasts,
-                    "units": units
+                    # Only the fields the report uses, not the raw OWM entries
+                    "forecasts": [
+                        {
+                            "date": forecast['dt_txt'][:10],
+                            "temp": forecast['main']['temp'],
+                            "condition": forecast['weather'][0]['description']
+                        }
+                        for forecast in forecasts
+                    ],
+                    "units": units,
+                    "cache_control": {"max_age": self._FORECAST_TTL}
                 }
             }
         except (KeyError, IndexError) as e:
-            logger.error(f"Error formatting forecast response: {e}")
+            logger.error("Error formatting forecast response: %s", e)
             return {
                 "status": "error",
                 "error_message": "Failed to parse forecast data"
             }
     
-    def _get_temperature_unit(self, units: str) -> str:
-        """Get temperature unit symbol based on units."""
-        unit_map = {
-            'metric': 'C',
-            'imperial': 'F',
-            'kelvin': 'K'
-        }
-        return unit_map.get(units, 'C')
-    
-    def _get_speed_unit(self, units: str) -> str:
-        """Get wind speed unit based on units."""
-        unit_map = {
-            'metric': 'm/s',
-            'imperial': 'mph',
-            'kelvin': 'm/s'
-        }
-        return unit_map.get(units, 'm/s')
-    
-    def _get_mock_weather(self, city: str) -> Dict[str, Any]:
+    def get_mock_weather(self, city_norm: str, city_display: str) -> Dict[str, Any]:
         """
         Provide mock weather data when API key is not available.
         
         Args:
-            city (str): City name
+            city_norm (str): Casefolded city name
+            city_display (str): Title-cased city name for messages
             
         Returns:
             Dict[str, Any]: Mock weather data
         """
-        # Simple mock data for demonstration
-        mock_data = {
-            "new york": {
-                "temp": 22.5,
-                "condition": "partly cloudy",
-                "humidity": 65,
-                "wind_speed": 3.2
-            },
-            "london": {
-                "temp": 15.8,
-                "condition": "overcast",
-                "humidity": 78,
-                "wind_speed": 2.1
-            },
-            "lagos": {
-                "temp": 31.3,
-                "condition": "sunny",
-                "humidity": 55,
-                "wind_speed": 1.8
-            },
-            "paris": {
-                "temp": 18.7,
-                "condition": "light rain",
-                "humidity": 82,
-                "wind_speed": 2.5
-            },
-            "sydney": {
-                "temp": 24.1,
-                "condition": "clear sky",
-                "humidity": 60,
-                "wind_speed": 4.1
-            }
-        }
-        
-        city_lower = city.lower()
-        if city_lower in mock_data:
-            data = mock_data[city_lower]
-            report = f"""Current weather in {city.title()} (Demo Data):
-Temperature: {data['temp']:.1f}°C
-Condition: {data['condition'].title()}
-Humidity: {data['humidity']}%
-Wind: {data['wind_speed']:.1f} m/s
-Note: This is demo data. Set OPENWEATHER_API_KEY for real-time data."""
-            
+        data = _MOCK_WEATHER.get(city_norm)
+        if data is not None:
             return {
                 "status": "success",
-                "report": report,
-                "data": data
-            }
-        else:
-            return {
-                "status": "error",
-                "error_message": f"Demo weather data not available for '{city}'. Supported cities: {', '.join(mock_data.keys()).title()}"
+                "report": _MOCK_REPORTS[city_norm],
+                "data": dict(data)
             }
+        return {
+            "status": "error",
+            "error_message": f"Demo weather data not available for '{city_display}'. Supported cities: {_MOCK_SUPPORTED}"
+        }
 
 # Global instance
 weather_service = WeatherService()
+atexit.register(weather_service.close)
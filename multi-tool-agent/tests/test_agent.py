@@ -6,8 +6,11 @@ This script demonstrates the new capabilities of the weather and time agent.
 Run this script to test the functionality with or without an API key.
 """
 
+import asyncio
 import sys
 import os
+import threading
+import time
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -106,6 +109,134 @@ def test_error_handling():
     print(f"Status: {result['status']}")
     print(f"Error: {result.get('error_message', 'No error message')}")
 
+def test_request_coalescing():
+    """Test that waiters recover from a failed shared request and get their own copy of its result."""
+    print_separator("REQUEST COALESCING TESTING")
+    
+    from services.async_weather import AsyncWeatherService
+    from services.weather import WeatherService
+    
+    key = ('weather', 'coalesce test', 'metric')
+    
+    async def run_async(cancel_leader):
+        client = AsyncWeatherService()
+        calls = []
+        
+        async def fetch():
+            calls.append(None)
+            attempt = len(calls)
+            await asyncio.sleep(0.05)
+            if attempt == 1 and not cancel_leader:
+                raise RuntimeError("leader failed")
+            return {"status": "success", "attempt": attempt}
+        
+        leader = asyncio.ensure_future(client._coalesce(key, fetch))
+        await asyncio.sleep(0)  # let the leader register its in-flight future
+        waiter = asyncio.ensure_future(client._coalesce(key, fetch))
+        await asyncio.sleep(0)
+        if cancel_leader:
+            leader.cancel()
+        leader_result, waiter_result = await asyncio.gather(leader, waiter, return_exceptions=True)
+        assert waiter_result == {"status": "success", "attempt": 2}, waiter_result
+        assert not client._inflight
+        print(f"Leader: {type(leader_result).__name__}, waiter: {waiter_result}")
+    
+    async def run_async_isolation():
+        client = AsyncWeatherService()
+        
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return {"status": "success", "report": "shared"}
+        
+        async def modifying_caller():
+            result = await client._coalesce(key, fetch)
+            result["report"] += " (modified by leader caller)"
+            return result
+        
+        leader = asyncio.ensure_future(modifying_caller())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(client._coalesce(key, fetch))
+        leader_result, waiter_result = await asyncio.gather(leader, waiter)
+        assert waiter_result["report"] == "shared", waiter_result
+        print(f"Leader: {leader_result['report']!r}, waiter: {waiter_result['report']!r}")
+    
+    print("Testing async waiter when the leader raises...")
+    asyncio.run(run_async(cancel_leader=False))
+    print("Testing async waiter when the leader is cancelled...")
+    asyncio.run(run_async(cancel_leader=True))
+    print("Testing async waiter when the leader's caller modifies its result...")
+    asyncio.run(run_async_isolation())
+    
+    print("\n" + "-"*40)
+    
+    print("Testing sync waiter when the leader raises...")
+    service = WeatherService()
+    leader_started = threading.Event()
+    release_leader = threading.Event()
+    calls = []
+    
+    def fetch_and_cache(key, endpoint, params, handle):
+        calls.append(None)
+        if len(calls) == 1:
+            leader_started.set()
+            release_leader.wait()
+            raise RuntimeError("leader failed")
+        return {"status": "success", "attempt": len(calls)}
+    
+    service._fetch_and_cache = fetch_and_cache
+    results = {}
+    
+    def call(name):
+        try:
+            results[name] = service._fetch_cached(key, 'weather', {}, None)
+        except RuntimeError as e:
+            results[name] = e
+    
+    leader = threading.Thread(target=call, args=("leader",))
+    leader.start()
+    leader_started.wait()
+    waiter = threading.Thread(target=call, args=("waiter",))
+    waiter.start()
+    time.sleep(0.1)  # give the waiter time to block on the leader's request
+    release_leader.set()
+    leader.join()
+    waiter.join()
+    service.close()
+    assert isinstance(results["leader"], RuntimeError), results
+    assert results["waiter"]["status"] == "success", results
+    print(f"Leader: {type(results['leader']).__name__}, waiter: {results['waiter']}")
+    
+    print("Testing sync waiter when the leader's caller modifies its result...")
+    service = WeatherService()
+    leader_started.clear()
+    release_leader.clear()
+    
+    def shared_fetch_and_cache(key, endpoint, params, handle):
+        leader_started.set()
+        release_leader.wait()
+        return {"status": "success", "report": "shared"}
+    
+    service._fetch_and_cache = shared_fetch_and_cache
+    results = {}
+    
+    def modifying_call():
+        result = service._fetch_cached(key, 'weather', {}, None)
+        result["report"] += " (modified by leader caller)"
+        results["leader"] = result
+    
+    leader = threading.Thread(target=modifying_call)
+    leader.start()
+    leader_started.wait()
+    waiter = threading.Thread(target=call, args=("waiter",))
+    waiter.start()
+    time.sleep(0.1)
+    release_leader.set()
+    leader.join()
+    waiter.join()
+    service.close()
+    assert results["waiter"]["report"] == "shared", results
+    print(f"Leader: {results['leader']['report']!r}, waiter: {results['waiter']['report']!r}")
+
 def main():
     """Main test function."""
     print("Enhanced Multi-Tool Agent Testing")
@@ -114,7 +245,8 @@ def main():
     print("The agent works with or without an OpenWeatherMap API key.")
     
     # Check if API key is configured
-    from config import Config
+    from config import Config, configure_logging
+    configure_logging()
     if Config.OPENWEATHER_API_KEY:
         print("OpenWeatherMap API key is configured - using real-time data")
     else:
@@ -127,6 +259,7 @@ def main():
         test_time()
         test_location()
         test_error_handling()
+        test_request_coalescing()
         
         print_separator("AGENT INFORMATION")
         print(f"Agent Name: {root_agent.name}")